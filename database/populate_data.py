@@ -1,5 +1,7 @@
 import psycopg2
 from psycopg2.extras import execute_values
+import argparse
+import itertools
 import random
 import faker
 
@@ -227,7 +229,66 @@ def create_indexes(cursor):
 def connect_db():
     return psycopg2.connect(**DB_PARAMS)
 
-def populate_users(conn, num_records=1000):
+# Rows sent per INSERT statement in unique-key mode
+BATCH_SIZE = 10000
+# Number of distinct faker values reused (with a unique suffix) in unique-key mode
+FAKER_POOL_SIZE = 1000
+
+def insert_in_batches(conn, insert_sql, rows, batch_size=BATCH_SIZE):
+    """Insert rows from an iterable in fixed-size batches, committing after each.
+
+    Returns the number of rows actually inserted, so statements using
+    ON CONFLICT DO NOTHING report skipped rows correctly.
+    """
+    inserted = 0
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            break
+        with conn.cursor() as cur:
+            # One statement per batch so rowcount covers the whole batch
+            execute_values(cur, insert_sql, batch, page_size=len(batch))
+            inserted += cur.rowcount
+        conn.commit()
+    return inserted
+
+def generate_unique_users(num_records, start=0):
+    """Yield user rows whose username and email are unique by construction.
+
+    Each row gets a numeric suffix, so no duplicate checks are needed at any
+    scale. Faker values are drawn from a small pool to keep generation fast.
+    """
+    pool_size = min(FAKER_POOL_SIZE, max(num_records, 1))
+    user_names = [fake.user_name() for _ in range(pool_size)]
+    full_names = [fake.name() for _ in range(pool_size)]
+    domains = [fake.free_email_domain() for _ in range(pool_size)]
+    last_logins = [fake.date_time_this_year() for _ in range(pool_size)]
+
+    for n in range(start, start + num_records):
+        base = random.choice(user_names)[:38]
+        yield (
+            f"{base}_{n}",
+            f"{base}.{n}@{random.choice(domains)}",
+            random.choice(full_names),
+            random.choice(last_logins),
+            random.choice([True, False])
+        )
+
+def populate_users_unique(conn, num_records=1000):
+    """Insert users with suffix-based unique keys in batches."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT COALESCE(MAX(user_id), 0) FROM users")
+        start = cur.fetchone()[0]
+
+    inserted = insert_in_batches(conn, """
+        INSERT INTO users (username, email, full_name, last_login, is_active)
+        VALUES %s
+        ON CONFLICT DO NOTHING
+    """, generate_unique_users(num_records, start=start))
+    print(f"Added {inserted} new users")
+
+def populate_users(conn, num_records=1000, unique_keys=False):
     # First check if table is empty
     with conn.cursor() as cur:
         cur.execute("SELECT COUNT(*) FROM users")
@@ -236,6 +297,10 @@ def populate_users(conn, num_records=1000):
         if count > 0:
             print(f"Users table already has {count} records. Skipping.")
             return
+
+    if unique_keys:
+        populate_users_unique(conn, num_records)
+        return
     
     # Generate fake usernames and emails
     usernames = set()
@@ -512,7 +577,23 @@ def populate_reviews(conn, num_records=2000):
     conn.commit()
     print(f"Added {len(reviews_data)} new reviews")
 
-def populate_product_suppliers(conn, num_records=2000):
+def sample_product_supplier_pairs(product_ids, supplier_ids, num_records):
+    """Yield distinct (product_id, supplier_id) pairs sampled without replacement.
+
+    Pairs are addressed by a linear index over the product x supplier space,
+    so sampling never retries and fills up to the full matrix if asked to.
+    """
+    num_suppliers = len(supplier_ids)
+    total_pairs = len(product_ids) * num_suppliers
+    for index in random.sample(range(total_pairs), min(num_records, total_pairs)):
+        product_index, supplier_index = divmod(index, num_suppliers)
+        yield (
+            product_ids[product_index],
+            supplier_ids[supplier_index],
+            round(random.uniform(5, 500), 2)
+        )
+
+def populate_product_suppliers(conn, num_records=2000, unique_keys=False):
     # Check if product_suppliers already exist (this is also checked in main, but adding here for consistency)
     with conn.cursor() as cur:
         cur.execute("SELECT COUNT(*) FROM product_suppliers")
@@ -533,6 +614,18 @@ def populate_product_suppliers(conn, num_records=2000):
     if not valid_product_ids or not valid_supplier_ids:
         print("No products or suppliers found. Cannot create product-supplier relationships.")
         return
+
+    if unique_keys:
+        total_pairs = len(valid_product_ids) * len(valid_supplier_ids)
+        if num_records > total_pairs:
+            print(f"Only {total_pairs} product-supplier pairs exist. Capping at {total_pairs}.")
+        inserted = insert_in_batches(conn, """
+            INSERT INTO product_suppliers (product_id, supplier_id, supply_price)
+            VALUES %s
+            ON CONFLICT DO NOTHING
+        """, sample_product_supplier_pairs(valid_product_ids, valid_supplier_ids, num_records))
+        print(f"Added {inserted} new product suppliers")
+        return
     
     # If no product_suppliers exist, generate and insert new product_suppliers
     # We need to ensure we don't violate the PRIMARY KEY constraint (product_id, supplier_id)
@@ -570,7 +663,7 @@ def populate_product_suppliers(conn, num_records=2000):
     else:
         print("Could not create any product-supplier relationships.")
 
-def main():
+def main(unique_keys=False, num_users=1000, num_product_suppliers=2000):
     # First, ensure database exists and tables are created
     create_database_if_not_exists()
     
@@ -580,7 +673,7 @@ def main():
         
         # Check each table individually and populate as needed
         populate_categories(conn)        
-        populate_users(conn)        
+        populate_users(conn, num_users, unique_keys=unique_keys)
         populate_products(conn)        
         populate_suppliers(conn)
         
@@ -623,7 +716,7 @@ def main():
             product_suppliers_count = cur.fetchone()[0]
             
         if product_suppliers_count == 0:
-            populate_product_suppliers(conn)
+            populate_product_suppliers(conn, num_product_suppliers, unique_keys=unique_keys)
             print("Product suppliers populated")
         else:
             print(f"Product_suppliers table already has {product_suppliers_count} records. Skipping.")
@@ -637,4 +730,12 @@ def main():
         conn.close()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Create and populate test_db with sample data")
+    parser.add_argument("--unique-keys", action="store_true",
+                        help="Generate users and product-supplier pairs with guaranteed unique keys (scales to millions of rows)")
+    parser.add_argument("--users", type=int, default=1000, help="Number of users to generate")
+    parser.add_argument("--product-suppliers", type=int, default=2000,
+                        help="Number of product-supplier relationships to generate")
+    args = parser.parse_args()
+    main(unique_keys=args.unique_keys, num_users=args.users,
+         num_product_suppliers=args.product_suppliers)
@@ -0,0 +1,145 @@
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional
+
+from langchain_core.language_models.llms import LLM
+
+from rag_implementation import RAGSystem
+
+# Stand-in for SQLCoder that sleeps instead of generating
+class StubLLM(LLM):
+    latency: float = 0.5
+    sql: str = "SELECT 1;"
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> str:
+        time.sleep(self.latency)
+        if prompt.startswith("You are an SQL expert."):
+            return self.sql
+        return "This is a stub answer."
+
+# Read questions from a JSON lines log
+def load_questions(path: str, field: str = "question") -> list:
+    questions = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            # Fall back to "title" so request logs like requests.jsonl replay as-is
+            question = record.get(field) or record.get("title")
+            if question:
+                questions.append(question)
+    return questions
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def replay(rag_system, questions: list, rate: float = None, concurrency: int = 8, use_pipeline: bool = False) -> dict:
+    """Replay questions against the system and collect latency statistics.
+
+    Questions arrive at a fixed rate (per second) or all at once when rate is
+    None, and at most concurrency of them are processed at a time. Latency is
+    measured from arrival, so it includes time spent waiting for a worker.
+    """
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    coalesced_before = rag_system.coalesced_requests
+
+    def ask(question, arrival):
+        try:
+            if use_pipeline:
+                rag_system.submit(question).result()
+            else:
+                rag_system.process_question(question)
+        except Exception as e:
+            with lock:
+                errors.append(str(e))
+            return
+        with lock:
+            latencies.append(time.perf_counter() - arrival)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="replay") as executor:
+        for i, question in enumerate(questions):
+            if rate:
+                delay = start + i / rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            executor.submit(ask, question, time.perf_counter())
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    coalesced = rag_system.coalesced_requests - coalesced_before
+    return {
+        "questions": len(questions),
+        "completed": len(latencies),
+        "errors": len(errors),
+        "elapsed_s": elapsed,
+        "throughput_qps": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_p50_s": percentile(latencies, 0.50),
+        "latency_p90_s": percentile(latencies, 0.90),
+        "latency_p99_s": percentile(latencies, 0.99),
+        "latency_max_s": latencies[-1] if latencies else 0.0,
+        "coalesced": coalesced,
+        "coalesced_pct": 100 * coalesced / len(questions) if questions else 0.0,
+    }
+
+def print_report(report: dict):
+    print("\nReplay report")
+    print(f"  Questions:   {report['questions']} ({report['completed']} completed, {report['errors']} errors)")
+    print(f"  Elapsed:     {report['elapsed_s']:.2f}s")
+    print(f"  Throughput:  {report['throughput_qps']:.2f} questions/s")
+    print(f"  Latency:     p50 {report['latency_p50_s']:.3f}s  p90 {report['latency_p90_s']:.3f}s  "
+          f"p99 {report['latency_p99_s']:.3f}s  max {report['latency_max_s']:.3f}s")
+    print(f"  Coalesced:   {report['coalesced']} ({report['coalesced_pct']:.1f}% of generations saved)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a JSON lines question log against the RAG system")
+    parser.add_argument("log", help="JSON lines file with one question per line")
+    parser.add_argument("--field", default="question", help="Field holding the question text")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="Arrival rate in questions per second (default: all at once)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum questions in flight")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay the log this many times")
+    parser.add_argument("--pipeline", action="store_true", help="Use the staged pipeline instead of process_question")
+    parser.add_argument("--stub-llm", action="store_true", help="Replace SQLCoder with a sleeping stub")
+    parser.add_argument("--stub-latency", type=float, default=0.5, help="Seconds per stub LLM call")
+    parser.add_argument("--stub-sql", default="SELECT 1;", help="SQL returned by the stub LLM")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    questions = load_questions(args.log, args.field) * args.repeat
+    if not questions:
+        print(f"No questions found in {args.log}")
+        return
+
+    if args.stub_llm:
+        # Raw retrieved chunks avoid loading the SQLCoder tokenizer for the context budget
+        rag_system = RAGSystem(llm_loader=lambda: StubLLM(latency=args.stub_latency, sql=args.stub_sql),
+                               context_token_budget=None)
+    else:
+        rag_system = RAGSystem()
+
+    report = replay(rag_system, questions, rate=args.rate, concurrency=args.concurrency,
+                    use_pipeline=args.pipeline)
+    rag_system.shutdown()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+if __name__ == "__main__":
+    main()